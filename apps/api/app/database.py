@@ -1,18 +1,63 @@
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 from app.models import Base
 
-# Ensure data dir exists for SQLite
+# Ensure data dir exists for SQLite (exist_ok keeps this safe across workers)
 Path(settings.DATA_DIR).mkdir(parents=True, exist_ok=True)
 
+# Arbitrary constant shared by all workers: serializes create_all on Postgres
+_INIT_LOCK_KEY = 0x42B0B0DD
+
+_url = make_url(settings.DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+IS_POSTGRES = _url.get_backend_name() == "postgresql"
+
+
+def _engine_options() -> dict[str, Any]:
+    if not IS_SQLITE:
+        return {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    if _url.database in (None, "", ":memory:"):
+        return {}
+    # One writer at a time in SQLite: a small pool, no overflow, wait on busy instead of failing
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": 0,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_args": {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+    }
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
+    **_engine_options(),
 )
 
+if IS_SQLITE:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.close()
+
+
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -23,7 +68,12 @@ async_session = async_sessionmaker(
 
 
 async def init_db():
+    """Create tables. Safe to run concurrently from several workers."""
     async with engine.begin() as conn:
+        if IS_POSTGRES:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _INIT_LOCK_KEY})
+        elif IS_SQLITE:
+            await conn.exec_driver_sql("BEGIN IMMEDIATE")
         await conn.run_sync(Base.metadata.create_all)
 
 
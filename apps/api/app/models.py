@@ -58,3 +58,39 @@ class DocumentMessage(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     document: Mapped["Document"] = relationship(back_populates="messages")
+
+
+class PurgeJob(Base):
+    __tablename__ = "purge_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # pending | running | done | failed
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    deleted: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    # Heartbeat: bumped on every progress update, so jobs of a dead worker can be detected
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# Mailbox ingestion checkpoint: messages already scanned for attachments
+class IngestedMessage(Base):
+    __tablename__ = "ingested_messages"
+
+    mailbox: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    message_key: Mapped[str] = mapped_column(String(512), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+# Attachment content hash → document created from it (duplicates are skipped)
+class IngestedAttachment(Base):
+    __tablename__ = "ingested_attachments"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), nullable=False)
+    # Mailbox that ingested it; a re-run only resumes its own unfinished documents
+    mailbox: Mapped[str] = mapped_column(String(1024), nullable=False, index=True)
@@ -3,17 +3,40 @@ Document routes: upload, get, extract-text, analyze, chat.
 """
 
 import contextlib
+import hashlib
+import json
 import shutil
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
+from typing import Any
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
+from pydantic import TypeAdapter
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
-from app.models import Document, DocumentAnalysis, DocumentMessage, DocumentText
+from app.models import (
+    Document,
+    DocumentAnalysis,
+    DocumentMessage,
+    DocumentText,
+    IngestedAttachment,
+    PurgeJob,
+)
 from app.schemas import (
     AnalysisOut,
     ChatMessageIn,
@@ -21,15 +44,61 @@ from app.schemas import (
     DocumentDetailOut,
     DocumentOut,
     ExtractTextOut,
+    PurgeJobOut,
 )
 from app.services.analyze import analyze_document_text
 from app.services.chat import chat_with_document
 from app.services.extract import extract_text
+from app.services.pipeline import extract_and_analyze
+from app.services.purge import is_stale, run_purge_job
+from app.services.resilience import LLMError
+from app.services.response_cache import LIST_KEY, CachedResponse, response_cache
 
 router = APIRouter()
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+_documents_adapter = TypeAdapter(list[DocumentOut])
+_messages_adapter = TypeAdapter(list[ChatMessageOut])
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
+def _etag(name: str, body: bytes, rows: Iterable[Any] = ()) -> str:
+    """
+    Strong validator over the served body and the (id, created_at) of the rows behind it, so a
+    row that reuses a deleted row's id never matches the old ETag.
+    """
+    digest = hashlib.sha1(body, usedforsecurity=False)
+    for row in rows:
+        digest.update(f"{row.id}:{_as_utc(row.created_at).isoformat()};".encode())
+    return f'"{name}-{digest.hexdigest()[:16]}"'
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return entry.etag in tags or "*" in tags
+    since = request.headers.get("if-modified-since")
+    if since and entry.last_modified:
+        with contextlib.suppress(TypeError, ValueError):
+            modified = _as_utc(entry.last_modified).replace(microsecond=0)
+            return modified <= parsedate_to_datetime(since)
+    return False
+
+
+def _cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Serve a cached body, or 304 when the client's ETag / Last-Modified still matches."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.last_modified:
+        headers["Last-Modified"] = format_datetime(_as_utc(entry.last_modified), usegmt=True)
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
 
 def _create_document(
     file: UploadFile,
@@ -71,17 +140,26 @@ async def create_document(
 ):
     """Upload a PDF or image. File is stored locally."""
     doc = _create_document(file, db)
-    await db.flush()
+    await db.commit()
     await db.refresh(doc)
+    response_cache.invalidate(doc.id)
     return doc
 
 
 @router.get("", response_model=list[DocumentOut])
 @router.get("/", response_model=list[DocumentOut])
-async def list_documents(db: AsyncSession = Depends(get_db)):
+async def list_documents(request: Request, db: AsyncSession = Depends(get_db)):
     """List all documents (newest first)."""
-    result = await db.execute(select(Document).order_by(Document.created_at.desc()))
-    return list(result.scalars().all())
+    entry = response_cache.get(None, LIST_KEY)
+    if not entry:
+        generation = response_cache.generation
+        result = await db.execute(select(Document).order_by(Document.created_at.desc()))
+        rows = result.scalars().all()
+        docs = _documents_adapter.validate_python(rows, from_attributes=True)
+        body = _documents_adapter.dump_json(docs)
+        etag = _etag("documents", body, rows)
+        entry = response_cache.put(None, LIST_KEY, body, etag, generation=generation)
+    return _cached_response(request, entry)
 
 
 @router.delete("/{document_id}", status_code=204)
@@ -99,8 +177,12 @@ async def delete_document(
     await db.execute(delete(DocumentMessage).where(DocumentMessage.document_id == document_id))
     await db.execute(delete(DocumentAnalysis).where(DocumentAnalysis.document_id == document_id))
     await db.execute(delete(DocumentText).where(DocumentText.document_id == document_id))
+    await db.execute(
+        delete(IngestedAttachment).where(IngestedAttachment.document_id == document_id)
+    )
     await db.execute(delete(Document).where(Document.id == document_id))
-    await db.flush()
+    await db.commit()
+    response_cache.invalidate(document_id)
 
     # Remove file from disk
     if doc.storage_path:
@@ -111,24 +193,36 @@ async def delete_document(
     return None
 
 
-@router.delete("", status_code=204)
-@router.delete("/", status_code=204)
-async def delete_all_documents(db: AsyncSession = Depends(get_db)):
-    """Delete all documents and all related data. Removes all uploaded files from disk."""
-    result = await db.execute(select(Document))
-    docs = list(result.scalars().all())
-    for doc in docs:
-        if doc.storage_path:
-            path = Path(doc.storage_path)
-            if path.exists():
-                with contextlib.suppress(OSError):
-                    path.unlink()
-    await db.execute(delete(DocumentMessage))
-    await db.execute(delete(DocumentAnalysis))
-    await db.execute(delete(DocumentText))
-    await db.execute(delete(Document))
-    await db.flush()
-    return None
+@router.delete("", status_code=202, response_model=PurgeJobOut)
+@router.delete("/", status_code=202, response_model=PurgeJobOut)
+async def delete_all_documents(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """Start deleting all documents and related data in the background. Poll the returned job."""
+    job = PurgeJob(status="pending")
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    background_tasks.add_task(run_purge_job, job.id)
+    return job
+
+
+@router.get("/purges/{job_id}", response_model=PurgeJobOut)
+async def get_purge_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Progress of a bulk delete started with DELETE /documents."""
+    job = await db.get(PurgeJob, job_id)
+    if not job:
+        raise HTTPException(404, "Purge job not found")
+    if is_stale(job):
+        job.status = "failed"
+        job.error = "Purge was interrupted; start it again"
+        job.finished_at = datetime.utcnow()
+        await db.flush()
+    return job
 
 
 @router.get("/{document_id}", response_model=DocumentDetailOut)
@@ -191,7 +285,8 @@ async def extract_document_text(
             extraction_method=method,
         )
         db.add(row)
-    await db.flush()
+    await db.commit()
+    response_cache.invalidate(document_id)
 
     return ExtractTextOut(
         document_id=document_id,
@@ -215,34 +310,43 @@ async def analyze_document(
         select(DocumentText).where(DocumentText.document_id == document_id)
     )
     text_row = text_result.scalar_one_or_none()
-    if not text_row:
-        if not doc.storage_path or not Path(doc.storage_path).exists():
-            raise HTTPException(400, "Extract text first or file missing")
-        path = Path(doc.storage_path)
-        text, method = extract_text(path, doc.mimetype)
-        text_row = DocumentText(
-            document_id=document_id,
-            text=text,
-            extraction_method=method,
-        )
-        db.add(text_row)
-        await db.flush()
-
-    analysis_json = await analyze_document_text(text_row.text)
+    analysis_json: dict | None = None
+    try:
+        if not text_row:
+            if not doc.storage_path or not Path(doc.storage_path).exists():
+                raise HTTPException(400, "Extract text first or file missing")
+            path = Path(doc.storage_path)
+            if settings.PIPELINE_ANALYSIS:
+                text, method, analysis_json, model = await extract_and_analyze(path, doc.mimetype)
+            else:
+                text, method = extract_text(path, doc.mimetype)
+            text_row = DocumentText(
+                document_id=document_id,
+                text=text,
+                extraction_method=method,
+            )
+            db.add(text_row)
+            await db.flush()
+
+        if analysis_json is None:
+            analysis_json, model = await analyze_document_text(text_row.text)
+    except LLMError as e:
+        raise HTTPException(e.status_code, f"Analysis failed: {e}") from e
 
     analysis_row = DocumentAnalysis(
         document_id=document_id,
         json=analysis_json,
-        model=settings.OPENAI_MODEL,
+        model=model,
     )
     db.add(analysis_row)
-    await db.flush()
+    await db.commit()
     await db.refresh(analysis_row)
+    response_cache.invalidate(document_id)
 
     return AnalysisOut(
         document_id=document_id,
         analysis=analysis_json,
-        model=settings.OPENAI_MODEL,
+        model=model,
         created_at=analysis_row.created_at,
     )
 
@@ -250,41 +354,65 @@ async def analyze_document(
 @router.get("/{document_id}/analysis", response_model=AnalysisOut)
 async def get_latest_analysis(
     document_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Get the latest analysis for a document. 404 if none."""
-    result = await db.execute(
-        select(DocumentAnalysis)
-        .where(DocumentAnalysis.document_id == document_id)
-        .order_by(DocumentAnalysis.created_at.desc())
-        .limit(1)
-    )
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(404, "No analysis yet")
-    return AnalysisOut(
-        document_id=document_id,
-        analysis=row.json,
-        model=row.model,
-        created_at=row.created_at,
-    )
+    entry = response_cache.get(document_id, "analysis")
+    if not entry:
+        generation = response_cache.generation
+        result = await db.execute(
+            select(DocumentAnalysis)
+            .where(DocumentAnalysis.document_id == document_id)
+            .order_by(DocumentAnalysis.created_at.desc())
+            .limit(1)
+        )
+        row = result.scalar_one_or_none()
+        if not row:
+            raise HTTPException(404, "No analysis yet")
+        out = AnalysisOut(
+            document_id=document_id,
+            analysis=row.json,
+            model=row.model,
+            created_at=row.created_at,
+        )
+        body = out.model_dump_json().encode()
+        entry = response_cache.put(
+            document_id,
+            "analysis",
+            body,
+            _etag("analysis", body, [row]),
+            row.created_at,
+            generation,
+        )
+    return _cached_response(request, entry)
 
 
 @router.get("/{document_id}/text")
 async def get_document_text(
     document_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Get extracted text. Returns 404 if not extracted yet."""
-    result = await db.execute(select(DocumentText).where(DocumentText.document_id == document_id))
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(404, "Text not extracted. Call POST /extract-text first.")
-    return {
-        "document_id": document_id,
-        "text": row.text,
-        "extraction_method": row.extraction_method,
-    }
+    entry = response_cache.get(document_id, "text")
+    if not entry:
+        generation = response_cache.generation
+        result = await db.execute(
+            select(DocumentText).where(DocumentText.document_id == document_id)
+        )
+        row = result.scalar_one_or_none()
+        if not row:
+            raise HTTPException(404, "Text not extracted. Call POST /extract-text first.")
+        payload = {
+            "document_id": document_id,
+            "text": row.text,
+            "extraction_method": row.extraction_method,
+        }
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        etag = _etag("text", body)
+        entry = response_cache.put(document_id, "text", body, etag, generation=generation)
+    return _cached_response(request, entry)
 
 
 @router.post("/{document_id}/chat", response_model=ChatMessageOut)
@@ -322,12 +450,15 @@ async def document_chat(
     )
     history = [{"role": m.role, "content": m.content} for m in messages_result.scalars().all()]
 
-    reply = await chat_with_document(
-        document_text=text_row.text,
-        analysis_summary=summary,
-        history=history,
-        user_message=body.content,
-    )
+    try:
+        reply = await chat_with_document(
+            document_text=text_row.text,
+            analysis_summary=summary,
+            history=history,
+            user_message=body.content,
+        )
+    except LLMError as e:
+        raise HTTPException(e.status_code, f"Chat failed: {e}") from e
 
     user_msg = DocumentMessage(
         document_id=document_id,
@@ -342,8 +473,9 @@ async def document_chat(
         content=reply,
     )
     db.add(assistant_msg)
-    await db.flush()
+    await db.commit()
     await db.refresh(assistant_msg)
+    response_cache.invalidate(document_id)
 
     return ChatMessageOut(
         role="assistant",
@@ -355,15 +487,29 @@ async def document_chat(
 @router.get("/{document_id}/messages", response_model=list[ChatMessageOut])
 async def list_chat_messages(
     document_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """List chat messages for the document."""
-    result = await db.execute(
-        select(DocumentMessage)
-        .where(DocumentMessage.document_id == document_id)
-        .order_by(DocumentMessage.created_at.asc())
-    )
-    return [
-        ChatMessageOut(role=m.role, content=m.content, created_at=m.created_at)
-        for m in result.scalars().all()
-    ]
+    entry = response_cache.get(document_id, "messages")
+    if not entry:
+        generation = response_cache.generation
+        result = await db.execute(
+            select(DocumentMessage)
+            .where(DocumentMessage.document_id == document_id)
+            .order_by(DocumentMessage.created_at.asc())
+        )
+        rows = list(result.scalars().all())
+        messages = [
+            ChatMessageOut(role=m.role, content=m.content, created_at=m.created_at) for m in rows
+        ]
+        body = _messages_adapter.dump_json(messages)
+        entry = response_cache.put(
+            document_id,
+            "messages",
+            body,
+            _etag("messages", body, rows),
+            rows[-1].created_at if rows else None,
+            generation,
+        )
+    return _cached_response(request, entry)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -33,6 +33,49 @@ class ExtractTextOut(BaseModel):
     extraction_method: str
 
 
+# LLM analysis output, mirroring packages/shared/schemas/analysis.json
+ISO_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+class AnalysisEvidence(BaseModel):
+    quote_de: str
+    page: int | None = Field(None, ge=1)
+
+
+class AnalysisAction(BaseModel):
+    title_en: str
+    details_en: str
+    due_date: str | None = Field(..., pattern=ISO_DATE)
+    confidence: float = Field(..., ge=0, le=1)
+    category: Literal["payment", "appointment", "form", "identity", "insurance", "tax", "other"]
+    evidence: AnalysisEvidence
+
+
+class AnalysisDeadline(BaseModel):
+    date: str = Field(..., pattern=ISO_DATE)
+    meaning_en: str
+    confidence: float = Field(..., ge=0, le=1)
+    evidence: AnalysisEvidence
+
+
+class AnalysisEntities(BaseModel):
+    sender: str | None = None
+    amount_eur: float | None = None
+    iban: str | None = None
+    reference_number: str | None = None
+    contact_phone: str | None = None
+    address: str | None = None
+
+
+class AnalysisResult(BaseModel):
+    language_detected: str
+    summary_en: str
+    overall_risk: Literal["low", "medium", "high"]
+    actions: list[AnalysisAction]
+    deadlines: list[AnalysisDeadline]
+    entities: AnalysisEntities
+
+
 class AnalysisOut(BaseModel):
     document_id: int
     analysis: dict[str, Any]
@@ -48,3 +91,16 @@ class ChatMessageOut(BaseModel):
     role: str
     content: str
     created_at: datetime
+
+
+class PurgeJobOut(BaseModel):
+    id: int
+    status: str
+    total: int
+    deleted: int
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -4,11 +4,28 @@ LLM analysis: send extracted text to OpenAI or Bedrock Nova and return structure
 
 import asyncio
 import json
+import logging
+import time
+from functools import partial
 from typing import Any
 
-from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from app.config import settings
+from app.schemas import AnalysisResult
+from app.services import engines
+from app.services.resilience import (
+    LLMError,
+    call_llm,
+    configured_routes,
+    deadline,
+    default_model,
+    has_credentials,
+)
+
+logger = logging.getLogger(__name__)
+
+MOCK_MODEL = "mock"
 
 # Prompt text aligned with shared package (keep in sync)
 ANALYSIS_SYSTEM = """You are BüroBuddy, an expert at understanding German bureaucratic letters (Behörden, banks, insurance, tax, etc.).
@@ -25,6 +42,11 @@ Rules:
 - Use the exact schema: language_detected, summary_en, overall_risk, actions[], deadlines[], entities{}."""
 
 
+RECONCILE_SYSTEM = """You are BüroBuddy. Parts of one German letter were analyzed separately and each got its own summary.
+Write one concise English summary of the whole letter, using the full text and the part summaries.
+Output ONLY valid JSON: {"summary_en": "..."}. No markdown, no explanation."""
+
+
 def build_user_prompt(text: str) -> str:
     return f"""Analyze this German letter text and return the structured JSON:
 
@@ -33,24 +55,135 @@ def build_user_prompt(text: str) -> str:
 ---"""
 
 
-async def analyze_document_text(text: str) -> dict[str, Any]:
+def build_reconcile_prompt(text: str, summaries: list[str]) -> str:
+    parts = "\n".join(f"{i}. {s}" for i, s in enumerate(summaries, 1))
+    return f"""Part summaries:
+{parts}
+
+Full letter text:
+---
+{text}
+---"""
+
+
+async def analyze_document_text(text: str, cascade: bool = True) -> tuple[dict[str, Any], str]:
     """
-    Call LLM (OpenAI or Bedrock Nova) and parse JSON. Returns the analysis dict.
+    Call LLM (OpenAI or Bedrock Nova) and parse JSON. Returns (analysis dict, model used).
+    With CASCADE_FAST_MODEL set, a cheap model goes first and the configured model only runs
+    when the fast result needs escalation (see escalation_reason) or the text is long. Pass
+    cascade=False when `text` is only part of a letter whose full length is not known yet.
+    Calls go through call_llm (timeouts, retries, fallback) under one shared deadline, of which
+    the fast pass may use at most CASCADE_FAST_DEADLINE_SECONDS; raises LLMError when all fail.
     """
-    if settings.LLM_PROVIDER == "bedrock":
-        return await _analyze_bedrock(text)
-    if not settings.OPENAI_API_KEY:
-        return _mock_analysis(text)
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    response = await client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=[
-            {"role": "system", "content": ANALYSIS_SYSTEM},
-            {"role": "user", "content": build_user_prompt(text)},
-        ],
-        temperature=0.2,
-    )
-    raw = response.choices[0].message.content or "{}"
+    primary = settings.LLM_PROVIDER
+    if not has_credentials(primary):
+        return _mock_analysis(text), MOCK_MODEL
+    until = deadline()
+    prompt = build_user_prompt(text)
+    strong = default_model(primary)
+    fast = settings.CASCADE_FAST_MODEL
+    if cascade and fast and fast != strong and len(text) <= settings.CASCADE_MAX_FAST_CHARS:
+        try:
+            call = partial(_complete, ANALYSIS_SYSTEM, prompt, fast, primary)
+            budget = min(settings.CASCADE_FAST_DEADLINE_SECONDS, settings.LLM_DEADLINE_SECONDS / 2)
+            fast_until = min(until, time.monotonic() + budget)
+            analysis, _ = await call_llm({(primary, fast): call}, fast_until, retries=0)
+            reason = escalation_reason(analysis)
+        except LLMError as e:
+            reason = f"fast model failed: {e}"
+        if not reason:
+            return analysis, fast
+        logger.info("Escalating analysis from %s to %s: %s", fast, strong, reason)
+    calls = {
+        (p, m): partial(_complete, ANALYSIS_SYSTEM, prompt, m, p) for p, m in configured_routes()
+    }
+    analysis, (_, model) = await call_llm(calls, until)
+    return analysis, model
+
+
+async def reconcile_summary(text: str, summaries: list[str], until: float | None = None) -> str:
+    """
+    One summary of a letter whose parts were analyzed separately, written by the configured model
+    over the full text within the deadline `until`. Falls back to the part summaries joined when
+    no LLM is available or the call fails.
+    """
+    summaries = list(dict.fromkeys(s for s in summaries if s))
+    joined = "\n\n".join(summaries)
+    if len(summaries) < 2 or not has_credentials(settings.LLM_PROVIDER):
+        return joined
+    prompt = build_reconcile_prompt(text, summaries)
+    calls = {
+        (p, m): partial(_complete, RECONCILE_SYSTEM, prompt, m, p) for p, m in configured_routes()
+    }
+    try:
+        result, _ = await call_llm(calls, until)
+    except LLMError as e:
+        logger.warning("Summary reconciliation failed, keeping part summaries: %s", e)
+        return joined
+    summary = result.get("summary_en") if isinstance(result, dict) else None
+    return summary if isinstance(summary, str) and summary else joined
+
+
+def escalation_reason(analysis: dict[str, Any]) -> str | None:
+    """Why a fast-model result is not good enough, or None to accept it."""
+    try:
+        result = AnalysisResult.model_validate(analysis)
+    except ValidationError as e:
+        return f"schema validation failed ({e.error_count()} errors)"
+    if result.overall_risk in settings.cascade_escalate_risks_list:
+        return f"overall_risk is {result.overall_risk}"
+    confidences = [a.confidence for a in result.actions] + [d.confidence for d in result.deadlines]
+    if confidences and min(confidences) < settings.CASCADE_MIN_CONFIDENCE:
+        return f"confidence {min(confidences):.2f} below {settings.CASCADE_MIN_CONFIDENCE}"
+    return None
+
+
+RISK_ORDER = ("low", "medium", "high")
+
+
+def normalize_analysis(analysis: Any) -> dict[str, Any]:
+    """
+    Coerce the fields merge_analyses relies on: actions/deadlines become lists of objects,
+    entities an object and summary_en a string; anything else the model returned is dropped.
+    """
+    analysis = dict(analysis) if isinstance(analysis, dict) else {}
+    for key in ("actions", "deadlines"):
+        items = analysis.get(key)
+        analysis[key] = [i for i in items if isinstance(i, dict)] if isinstance(items, list) else []
+    if not isinstance(analysis.get("entities"), dict):
+        analysis["entities"] = {}
+    if not isinstance(analysis.get("summary_en"), str):
+        analysis["summary_en"] = ""
+    return analysis
+
+
+def merge_analyses(first: dict[str, Any], rest: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine analyses of consecutive parts of one letter: summaries joined (replace them with
+    reconcile_summary), the higher risk kept, actions/deadlines de-duplicated, entities taken
+    from the first part and filled from the rest. Malformed fields are normalized first.
+    """
+    first, rest = normalize_analysis(first), normalize_analysis(rest)
+    risks = [r for r in (first.get("overall_risk"), rest.get("overall_risk")) if r in RISK_ORDER]
+    actions = {}
+    for a in [*first["actions"], *rest["actions"]]:
+        actions.setdefault((str(a.get("title_en", "")).lower(), str(a.get("due_date"))), a)
+    deadlines = {}
+    for d in [*first["deadlines"], *rest["deadlines"]]:
+        deadlines.setdefault((str(d.get("date")), str(d.get("meaning_en", "")).lower()), d)
+    entities = dict(rest["entities"])
+    entities.update({k: v for k, v in first["entities"].items() if v is not None})
+    return {
+        "language_detected": first.get("language_detected") or rest.get("language_detected"),
+        "summary_en": "\n\n".join(s for s in (first["summary_en"], rest["summary_en"]) if s),
+        "overall_risk": max(risks, key=RISK_ORDER.index, default="low"),
+        "actions": list(actions.values()),
+        "deadlines": list(deadlines.values()),
+        "entities": entities,
+    }
+
+
+def _parse_json(raw: str) -> dict[str, Any]:
     # Strip markdown code block if present
     if raw.startswith("```"):
         lines = raw.split("\n")
@@ -62,50 +195,39 @@ async def analyze_document_text(text: str) -> dict[str, Any]:
     return json.loads(raw)
 
 
-def _call_bedrock_sync(text: str) -> dict[str, Any]:
-    """Sync Bedrock Converse call (run in thread)."""
-    import boto3
-    from botocore.config import Config
-
-    client = boto3.client(
-        "bedrock-runtime",
-        region_name=settings.AWS_REGION,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        config=Config(read_timeout=120),
+async def _complete(system: str, prompt: str, model: str, provider: str) -> dict[str, Any]:
+    if provider == "bedrock":
+        return await asyncio.to_thread(_call_bedrock_sync, system, prompt, model)
+    return await _call_openai(system, prompt, model)
+
+
+async def _call_openai(system: str, prompt: str, model: str) -> dict[str, Any]:
+    response = await engines.openai_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.2,
     )
-    system = [{"text": ANALYSIS_SYSTEM}]
-    messages = [{"role": "user", "content": [{"text": build_user_prompt(text)}]}]
+    return _parse_json(response.choices[0].message.content or "{}")
+
+
+def _call_bedrock_sync(system: str, prompt: str, model_id: str) -> dict[str, Any]:
+    """Sync Bedrock Converse call (run in thread)."""
+    messages = [{"role": "user", "content": [{"text": prompt}]}]
     inference_config = {"maxTokens": 4096, "temperature": 0.2}
-    resp = client.converse(
-        modelId=settings.BEDROCK_MODEL_ID,
-        system=system,
+    resp = engines.bedrock_client().converse(
+        modelId=model_id,
+        system=[{"text": system}],
         messages=messages,
         inferenceConfig=inference_config,
     )
-    output = resp.get("output", [])
-    if not output or "message" not in output[0]:
-        return _mock_analysis(text)
-    content = output[0]["message"].get("content", [])
-    raw = content[0].get("text", "{}") if content else "{}"
-    if raw.startswith("```"):
-        lines = raw.split("\n")
-        if lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        raw = "\n".join(lines)
-    return json.loads(raw)
-
-
-async def _analyze_bedrock(text: str) -> dict[str, Any]:
-    """Call Bedrock Nova (Nova Micro). Stub when AWS creds not set."""
-    if not settings.AWS_ACCESS_KEY_ID or not settings.AWS_SECRET_ACCESS_KEY:
-        return _mock_analysis(text)
-    try:
-        return await asyncio.to_thread(_call_bedrock_sync, text)
-    except Exception:
-        return _mock_analysis(text)
+    message = resp.get("output", {}).get("message")
+    if not message:
+        raise ValueError("Bedrock returned no message")
+    content = message.get("content", [])
+    return _parse_json(content[0].get("text", "{}") if content else "{}")
 
 
 def _mock_analysis(text: str) -> dict[str, Any]:
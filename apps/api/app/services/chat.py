@@ -2,9 +2,12 @@
 Document Q&A: chat with context of document text + analysis.
 """
 
-from openai import AsyncOpenAI
+import asyncio
+from functools import partial
 
 from app.config import settings
+from app.services import engines
+from app.services.resilience import call_llm, configured_routes, default_model, has_credentials
 
 
 async def chat_with_document(
@@ -15,9 +18,13 @@ async def chat_with_document(
 ) -> str:
     """
     Send user message + document context to LLM, return assistant reply.
+    Raises LLMError when every configured provider fails.
     """
-    if not settings.OPENAI_API_KEY:
-        return "Chat is disabled. Set OPENAI_API_KEY to enable document Q&A."
+    if not has_credentials(settings.LLM_PROVIDER):
+        return (
+            "Chat is disabled. Set OPENAI_API_KEY (or AWS credentials with LLM_PROVIDER=bedrock) "
+            "to enable document Q&A."
+        )
 
     system = f"""You are BüroBuddy. Answer questions about this German letter based ONLY on the following.
 
@@ -29,15 +36,37 @@ Analysis summary:
 
 Answer in English. Be concise. If the answer is not in the document, say so."""
 
-    messages: list[dict[str, str]] = [{"role": "system", "content": system}]
-    for h in history:
-        messages.append({"role": h["role"], "content": h["content"]})
+    messages = [{"role": h["role"], "content": h["content"]} for h in history]
     messages.append({"role": "user", "content": user_message})
 
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    response = await client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=messages,
+    calls = {route: partial(_reply, route[0], system, messages) for route in configured_routes()}
+    reply, _ = await call_llm(calls)
+    return reply
+
+
+async def _reply(provider: str, system: str, messages: list[dict[str, str]]) -> str:
+    if provider == "bedrock":
+        return await asyncio.to_thread(_reply_bedrock_sync, system, messages)
+    response = await engines.openai_client().chat.completions.create(
+        model=default_model(provider),
+        messages=[{"role": "system", "content": system}, *messages],
         temperature=0.3,
     )
     return (response.choices[0].message.content or "").strip()
+
+
+def _reply_bedrock_sync(system: str, messages: list[dict[str, str]]) -> str:
+    """Sync Bedrock Converse call (run in thread)."""
+    resp = engines.bedrock_client().converse(
+        modelId=default_model("bedrock"),
+        system=[{"text": system}],
+        messages=[{"role": m["role"], "content": [{"text": m["content"]}]} for m in messages],
+        inferenceConfig={"maxTokens": 1024, "temperature": 0.3},
+    )
+    message = resp.get("output", {}).get("message")
+    if not message:
+        raise ValueError("Bedrock returned no message")
+    content = message.get("content", [])
+    if not content or "text" not in content[0]:
+        raise ValueError("Bedrock returned no text")
+    return content[0]["text"].strip()
@@ -0,0 +1,99 @@
+"""
+Heavy dependencies (LLM SDKs, PDF/OCR libraries), imported on first use so startup stays fast.
+"""
+
+import contextlib
+from collections.abc import Callable, Iterable
+from functools import cache
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+    from openai import AsyncOpenAI
+
+
+@cache
+def openai_client() -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
+
+    # Retries and timeouts are handled by app.services.resilience
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        max_retries=0,
+    )
+
+
+@cache
+def bedrock_client() -> "BaseClient":
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(
+            read_timeout=settings.LLM_TIMEOUT_SECONDS,
+            retries={"total_max_attempts": 1},
+        ),
+    )
+
+
+@cache
+def pypdf2() -> ModuleType:
+    import PyPDF2
+
+    return PyPDF2
+
+
+@cache
+def pil_image() -> ModuleType:
+    from PIL import Image
+
+    return Image
+
+
+@cache
+def pytesseract() -> ModuleType | None:
+    try:
+        import pytesseract as module
+    except ImportError:
+        return None
+    return module
+
+
+@cache
+def pdf2image() -> ModuleType | None:
+    try:
+        import pdf2image as module
+    except ImportError:
+        return None
+    return module
+
+
+ENGINES: dict[str, Callable[[], object]] = {
+    "openai": openai_client,
+    "bedrock": bedrock_client,
+    "pdf": pypdf2,
+    "image": pil_image,
+    "ocr": pytesseract,
+    "pdf2image": pdf2image,
+}
+
+
+def warmup(names: Iterable[str]) -> list[str]:
+    """Preload the named engines and return the ones that loaded. Failures are skipped."""
+    loaded = []
+    for name in names:
+        loader = ENGINES.get(name)
+        if loader is None:
+            continue
+        with contextlib.suppress(Exception):
+            if loader() is not None:
+                loaded.append(name)
+    return loaded
@@ -2,25 +2,37 @@
 Text extraction: PDF text first, OCR fallback for images/scanned PDFs.
 """
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
-from PIL import Image
-from PyPDF2 import PdfReader
+from app.services import engines
 
-try:
-    import pytesseract
 
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
+def extract_pdf_text_layer(file_path: Path) -> str:
+    """Embedded text of all pages; empty for scanned PDFs."""
+    reader = engines.pypdf2().PdfReader(file_path)
+    parts = []
+    for page in reader.pages:
+        text = page.extract_text()
+        if text and text.strip():
+            parts.append(text.strip())
+    return "\n\n".join(parts)
+
+
+def iter_pdf_ocr_pages(file_path: Path) -> Iterator[str]:
+    """OCR a scanned PDF page by page, yielding each page's text as soon as it is recognized."""
+    pytesseract = engines.pytesseract()
+    pdf2image = engines.pdf2image()
+    if not (pdf2image and pytesseract):
+        return
+    page_count = len(engines.pypdf2().PdfReader(file_path).pages)
+    for n in range(1, page_count + 1):
+        for img in pdf2image.convert_from_path(file_path, dpi=200, first_page=n, last_page=n):
+            yield pytesseract.image_to_string(img, lang="deu+eng").strip()
 
-# Optional: pdf2image for PDF → images → OCR
-try:
-    from pdf2image import convert_from_path
 
-    PDF2IMAGE_AVAILABLE = True
-except ImportError:
-    PDF2IMAGE_AVAILABLE = False
+def join_pages(pages: Iterable[str]) -> str:
+    return "\n\n".join(p for p in pages if p)
 
 
 def extract_text_from_pdf(file_path: Path) -> tuple[str, str]:
@@ -28,34 +40,23 @@ def extract_text_from_pdf(file_path: Path) -> tuple[str, str]:
     Extract text from PDF. Returns (text, method).
     If no text found and OCR available, falls back to OCR.
     """
-    reader = PdfReader(file_path)
-    parts = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text and text.strip():
-            parts.append(text.strip())
-    text = "\n\n".join(parts) if parts else ""
-
-    if text.strip():
-        return text.strip(), "pdf"
+    text = extract_pdf_text_layer(file_path)
+    if text:
+        return text, "pdf"
 
-    if PDF2IMAGE_AVAILABLE and TESSERACT_AVAILABLE:
-        images = convert_from_path(file_path, dpi=200)
-        ocr_parts = []
-        for img in images:
-            ocr_parts.append(pytesseract.image_to_string(img, lang="deu+eng"))
-        text = "\n\n".join(p.strip() for p in ocr_parts if p.strip())
-        if text.strip():
-            return text.strip(), "ocr"
+    text = join_pages(iter_pdf_ocr_pages(file_path))
+    if text:
+        return text, "ocr"
 
-    return text or "(No text extracted)", "pdf"
+    return "(No text extracted)", "pdf"
 
 
 def extract_text_from_image(file_path: Path) -> tuple[str, str]:
     """Extract text from image using OCR."""
-    if not TESSERACT_AVAILABLE:
+    pytesseract = engines.pytesseract()
+    if not pytesseract:
         return "(OCR not available: install pytesseract and Tesseract)", "none"
-    img = Image.open(file_path)
+    img = engines.pil_image().open(file_path)
     text = pytesseract.image_to_string(img, lang="deu+eng")
     return (text.strip() or "(No text extracted)"), "ocr"
 
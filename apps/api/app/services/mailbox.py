@@ -0,0 +1,258 @@
+"""
+Mailbox ingestion: PDF/image attachments from a local Maildir or mbox → extract → analyze.
+"""
+
+import asyncio
+import hashlib
+import logging
+import mailbox
+from dataclasses import dataclass
+from email import policy
+from email.parser import BytesParser
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import settings
+from app.database import IS_POSTGRES, async_session
+from app.models import (
+    Document,
+    DocumentAnalysis,
+    DocumentText,
+    IngestedAttachment,
+    IngestedMessage,
+)
+from app.services.analyze import analyze_document_text
+from app.services.extract import extract_text
+from app.services.pipeline import extract_and_analyze
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_TYPES = {
+    "application/pdf": ".pdf",
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+}
+
+_parser = BytesParser(policy=policy.default)
+
+
+@dataclass
+class Attachment:
+    filename: str
+    mimetype: str
+    data: bytes
+    sha256: str
+
+
+@dataclass
+class IngestStats:
+    messages: int = 0
+    skipped_messages: int = 0
+    attachments: int = 0
+    duplicates: int = 0
+    processed: int = 0
+    failed: int = 0
+
+
+def open_mailbox(path: Path) -> mailbox.Mailbox:
+    """Maildir if the path is a directory with cur/ and new/, otherwise mbox."""
+    if (path / "cur").is_dir() and (path / "new").is_dir():
+        return mailbox.Maildir(path, factory=None, create=False)
+    return mailbox.mbox(path, factory=None, create=False)
+
+
+def read_attachments(box: mailbox.Mailbox, key: str | int) -> list[Attachment]:
+    """Parse one message and return its PDF/image parts (nested/forwarded messages included)."""
+    with box.get_file(key) as fp:
+        msg = _parser.parse(fp)
+    found = []
+    for part in msg.walk():
+        mimetype = part.get_content_type()
+        if mimetype not in ATTACHMENT_TYPES or part.is_multipart():
+            continue
+        data = part.get_payload(decode=True)
+        if not data:
+            continue
+        filename = part.get_filename() or f"attachment{ATTACHMENT_TYPES[mimetype]}"
+        found.append(Attachment(filename, mimetype, data, hashlib.sha256(data).hexdigest()))
+    return found
+
+
+def _store(attachment: Attachment) -> Path:
+    ext = Path(attachment.filename).suffix or ATTACHMENT_TYPES[attachment.mimetype]
+    path = Path(settings.UPLOAD_DIR) / f"{uuid4().hex}{ext}"
+    path.write_bytes(attachment.data)
+    return path
+
+
+async def _load_state(mailbox_id: str) -> tuple[set[str], set[str]]:
+    async with async_session() as db:
+        keys = await db.scalars(
+            select(IngestedMessage.message_key).where(IngestedMessage.mailbox == mailbox_id)
+        )
+        hashes = await db.scalars(select(IngestedAttachment.sha256))
+        return set(keys), set(hashes)
+
+
+async def _pending_documents(mailbox_id: str, analyze: bool) -> list[int]:
+    """
+    Documents from this mailbox whose extraction (or analysis) did not finish in an earlier run.
+    """
+    done = DocumentAnalysis if analyze else DocumentText
+    async with async_session() as db:
+        finished = select(done.id).where(done.document_id == IngestedAttachment.document_id)
+        result = await db.scalars(
+            select(IngestedAttachment.document_id)
+            .where(IngestedAttachment.mailbox == mailbox_id, ~finished.exists())
+            .order_by(IngestedAttachment.document_id)
+        )
+        return list(result)
+
+
+def _remove(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+async def _checkpoint(mailbox_id: str, keys: list[str], attachments: list[Attachment]) -> list[int]:
+    """
+    Create documents for new attachments and mark messages as ingested, in one transaction.
+    A hash claimed concurrently by another run is a duplicate: that document and file are dropped.
+    """
+    insert = postgresql.insert if IS_POSTGRES else sqlite.insert
+    paths = [await asyncio.to_thread(_store, a) for a in attachments]
+    created: list[int] = []
+    async with async_session() as db:
+        for a, path in zip(attachments, paths, strict=True):
+            doc = Document(
+                filename=a.filename,
+                mimetype=a.mimetype,
+                storage_path=str(path),
+                status="uploaded",
+            )
+            db.add(doc)
+            await db.flush()
+            claimed = await db.scalar(
+                insert(IngestedAttachment)
+                .values(sha256=a.sha256, document_id=doc.id, mailbox=mailbox_id)
+                .on_conflict_do_nothing(index_elements=[IngestedAttachment.sha256])
+                .returning(IngestedAttachment.sha256)
+            )
+            if claimed:
+                created.append(doc.id)
+                continue
+            await db.execute(delete(Document).where(Document.id == doc.id))
+            db.expunge(doc)
+            await asyncio.to_thread(_remove, path)
+        db.add_all(IngestedMessage(mailbox=mailbox_id, message_key=k) for k in keys)
+        await db.commit()
+        return created
+
+
+async def _save(*rows: object) -> None:
+    async with async_session() as db:
+        db.add_all(rows)
+        await db.commit()
+
+
+async def process_document(document_id: int, analyze: bool = True) -> None:
+    """
+    Extract text (in a thread) and optionally analyze, storing both like the API routes do.
+    No session is held during extraction or analysis, so concurrency is not bounded by the pool.
+    """
+    async with async_session() as db:
+        doc = await db.get(Document, document_id)
+        if not doc or not doc.storage_path:
+            return
+        path, mimetype = Path(doc.storage_path), doc.mimetype
+        text = await db.scalar(
+            select(DocumentText.text).where(DocumentText.document_id == document_id)
+        )
+    if text is None and analyze and settings.PIPELINE_ANALYSIS:
+        text, method, analysis_json, model = await extract_and_analyze(path, mimetype)
+        await _save(
+            DocumentText(document_id=document_id, text=text, extraction_method=method),
+            DocumentAnalysis(document_id=document_id, json=analysis_json, model=model),
+        )
+        return
+    if text is None:
+        text, method = await asyncio.to_thread(extract_text, path, mimetype)
+        await _save(DocumentText(document_id=document_id, text=text, extraction_method=method))
+    if analyze:
+        analysis_json, model = await analyze_document_text(text)
+        await _save(DocumentAnalysis(document_id=document_id, json=analysis_json, model=model))
+
+
+async def _worker(queue: asyncio.Queue[int | None], analyze: bool, stats: IngestStats) -> None:
+    while (document_id := await queue.get()) is not None:
+        try:
+            await process_document(document_id, analyze)
+            stats.processed += 1
+        except Exception:
+            logger.exception("Processing ingested document %s failed", document_id)
+            stats.failed += 1
+
+
+async def ingest_mailbox(
+    path: Path,
+    concurrency: int = 4,
+    analyze: bool = True,
+    checkpoint_every: int = 100,
+) -> IngestStats:
+    """
+    Stream a Maildir/mbox, store unseen PDF/image attachments as documents and run them through
+    extract → analyze with at most `concurrency` documents in flight. Messages are checkpointed,
+    so re-running only reads new messages and resumes documents an earlier run left unfinished.
+    mbox keys are message positions, so only append to an mbox between runs.
+    """
+    mailbox_id = str(path.resolve())
+    box = open_mailbox(path)
+    seen_keys, seen_hashes = await _load_state(mailbox_id)
+    stats = IngestStats()
+
+    queue: asyncio.Queue[int | None] = asyncio.Queue(maxsize=concurrency * 4)
+    workers = [asyncio.create_task(_worker(queue, analyze, stats)) for _ in range(concurrency)]
+
+    for document_id in await _pending_documents(mailbox_id, analyze):
+        await queue.put(document_id)
+
+    keys: list[str] = []
+    attachments: list[Attachment] = []
+
+    async def flush() -> None:
+        if not keys:
+            return
+        created = await _checkpoint(mailbox_id, keys, attachments)
+        stats.duplicates += len(attachments) - len(created)
+        for document_id in created:
+            await queue.put(document_id)
+        keys.clear()
+        attachments.clear()
+
+    try:
+        for box_key in box.iterkeys():
+            key = str(box_key)
+            if key in seen_keys:
+                stats.skipped_messages += 1
+                continue
+            stats.messages += 1
+            for a in await asyncio.to_thread(read_attachments, box, box_key):
+                stats.attachments += 1
+                if a.sha256 in seen_hashes:
+                    stats.duplicates += 1
+                    continue
+                seen_hashes.add(a.sha256)
+                attachments.append(a)
+            keys.append(key)
+            if len(keys) >= checkpoint_every:
+                await flush()
+        await flush()
+    finally:
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        box.close()
+    return stats
@@ -0,0 +1,106 @@
+"""
+Pipelined extract + analyze: scanned PDFs are OCR'd page by page while the first pages are
+already being analyzed, so end-to-end time approaches max(OCR, LLM) rather than their sum.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.services.analyze import (
+    analyze_document_text,
+    merge_analyses,
+    normalize_analysis,
+    reconcile_summary,
+)
+from app.services.extract import (
+    extract_pdf_text_layer,
+    extract_text,
+    iter_pdf_ocr_pages,
+    join_pages,
+)
+from app.services.resilience import deadline
+
+Result = tuple[str, str, dict[str, Any], str]
+
+
+async def extract_and_analyze(file_path: Path, mimetype: str) -> Result:
+    """
+    Returns (text, extraction_method, analysis, model). Only scanned PDFs are pipelined;
+    text PDFs and images are extracted first and analyzed afterwards, as before.
+    """
+    if "pdf" not in (mimetype or "").lower():
+        text, method = await asyncio.to_thread(extract_text, file_path, mimetype)
+        return text, method, *await analyze_document_text(text)
+    text = await asyncio.to_thread(extract_pdf_text_layer, file_path)
+    if text:
+        return text, "pdf", *await analyze_document_text(text)
+    return await _ocr_and_analyze(file_path)
+
+
+def _shift_evidence_pages(analysis: dict[str, Any], offset: int) -> dict[str, Any]:
+    """Turn evidence pages relative to a batch into pages of the whole document."""
+    analysis = normalize_analysis(analysis)
+    for item in [*analysis["actions"], *analysis["deadlines"]]:
+        evidence = item.get("evidence")
+        if isinstance(evidence, dict) and isinstance(evidence.get("page"), int):
+            evidence["page"] += offset
+    return analysis
+
+
+async def _ocr_and_analyze(file_path: Path) -> Result:
+    """
+    The first batch (a provisional analysis) goes out once PIPELINE_PROVISIONAL_PAGES pages with
+    text are recognized. Whenever the previous batch has finished, the pages OCR'd since are sent
+    as the next one, so after OCR only a short tail is left to analyze. The letter's length is not
+    known while batches go out, so they skip the fast-model cascade. Batch results are merged in
+    page order with merge_analyses, and reconcile_summary writes one summary over the full text;
+    after OCR, the tail batch and that summary together stay within one LLM_DEADLINE_SECONDS.
+    """
+    pages_iter = iter_pdf_ocr_pages(file_path)
+    min_pages = settings.PIPELINE_PROVISIONAL_PAGES
+    pages: list[str] = []
+    unsent: list[str] = []
+    tasks: list[asyncio.Task[tuple[dict[str, Any], str]]] = []
+    # Pages before each batch's first page with text
+    offsets: list[int] = []
+
+    def send_unsent() -> None:
+        offsets.append(len(pages) - len(unsent) + next(i for i, p in enumerate(unsent) if p))
+        tasks.append(asyncio.create_task(analyze_document_text(join_pages(unsent), cascade=False)))
+        unsent.clear()
+
+    try:
+        while (page := await asyncio.to_thread(next, pages_iter, None)) is not None:
+            pages.append(page)
+            unsent.append(page)
+            if not join_pages(unsent) or (tasks and not tasks[-1].done()):
+                continue
+            if tasks or len(pages) >= min_pages:
+                send_unsent()
+
+        text = join_pages(pages)
+        if not text:
+            return "(No text extracted)", "pdf", *await analyze_document_text("(No text extracted)")
+        # The tail batch and the summary after it share one LLM deadline from the end of OCR
+        until = deadline()
+        if join_pages(unsent):
+            send_unsent()
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    parts = [
+        _shift_evidence_pages(part, offset)
+        for (part, _), offset in zip(results, offsets, strict=True)
+    ]
+    analysis = parts[0]
+    for part in parts[1:]:
+        analysis = merge_analyses(analysis, part)
+    if len(parts) > 1:
+        summaries = [part.get("summary_en") or "" for part in parts]
+        analysis["summary_en"] = await reconcile_summary(text, summaries, until)
+    models = list(dict.fromkeys(model for _, model in results))
+    return text, "ocr", analysis, "+".join(models)
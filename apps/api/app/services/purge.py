@@ -0,0 +1,219 @@
+"""
+Bulk deletion: batched purges off the request path and retention-based auto-expiry.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import IO
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import settings
+from app.database import IS_POSTGRES, IS_SQLITE, async_session, engine
+from app.models import (
+    Document,
+    DocumentAnalysis,
+    DocumentMessage,
+    DocumentText,
+    IngestedAttachment,
+    PurgeJob,
+)
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Shared by all workers: only the holder of this lock runs the retention sweeper
+_SWEEPER_LOCK_KEY = 0x42B0B0DE
+
+
+def _remove_files(paths: list[str]) -> None:
+    for p in paths:
+        with contextlib.suppress(OSError):
+            Path(p).unlink(missing_ok=True)
+
+
+async def _delete_batch(before: datetime, batch_size: int) -> int:
+    """Delete up to batch_size documents created before `before` in one short transaction."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(Document.id, Document.storage_path)
+            .where(Document.created_at <= before)
+            .order_by(Document.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+        ids = [r.id for r in rows]
+        await db.execute(delete(DocumentMessage).where(DocumentMessage.document_id.in_(ids)))
+        await db.execute(delete(DocumentAnalysis).where(DocumentAnalysis.document_id.in_(ids)))
+        await db.execute(delete(DocumentText).where(DocumentText.document_id.in_(ids)))
+        await db.execute(delete(IngestedAttachment).where(IngestedAttachment.document_id.in_(ids)))
+        await db.execute(delete(Document).where(Document.id.in_(ids)))
+        await db.commit()
+    response_cache.clear()
+    await asyncio.to_thread(_remove_files, [r.storage_path for r in rows if r.storage_path])
+    return len(rows)
+
+
+async def purge_documents(
+    before: datetime,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+) -> int:
+    """Delete all documents created before `before`, batch by batch. Returns how many."""
+    deleted = 0
+    while True:
+        n = await _delete_batch(before, settings.PURGE_BATCH_SIZE)
+        if not n:
+            return deleted
+        deleted += n
+        if on_progress:
+            await on_progress(deleted)
+        await asyncio.sleep(0)
+
+
+async def _update_job(job_id: int, **values: object) -> None:
+    async with async_session() as db:
+        job = await db.get(PurgeJob, job_id)
+        if job:
+            for key, value in values.items():
+                setattr(job, key, value)
+            await db.commit()
+
+
+async def run_purge_job(job_id: int) -> None:
+    """Background task for DELETE /documents: purge everything uploaded before the job."""
+    async with async_session() as db:
+        job = await db.get(PurgeJob, job_id)
+        if not job:
+            return
+        before = job.created_at
+        total = await db.scalar(
+            select(func.count()).select_from(Document).where(Document.created_at <= before)
+        )
+    await _update_job(job_id, status="running", total=total or 0)
+
+    async def progress(deleted: int) -> None:
+        await _update_job(job_id, deleted=deleted)
+
+    try:
+        await purge_documents(before, progress)
+    except Exception as e:
+        logger.exception("Purge job %s failed", job_id)
+        await _update_job(job_id, status="failed", error=str(e), finished_at=datetime.utcnow())
+        return
+    await _update_job(job_id, status="done", finished_at=datetime.utcnow())
+
+
+def is_stale(job: PurgeJob) -> bool:
+    """True when a pending/running job has not reported progress for PURGE_JOB_STALE_SECONDS."""
+    if job.status not in ("pending", "running"):
+        return False
+    updated = job.updated_at
+    if updated.tzinfo is not None:
+        updated = updated.astimezone(UTC).replace(tzinfo=None)
+    return datetime.utcnow() - updated > timedelta(seconds=settings.PURGE_JOB_STALE_SECONDS)
+
+
+async def expire_documents() -> int:
+    """Delete documents older than RETENTION_DAYS. No-op when retention is disabled."""
+    if settings.RETENTION_DAYS <= 0:
+        return 0
+    before = datetime.utcnow() - timedelta(days=settings.RETENTION_DAYS)
+    return await purge_documents(before)
+
+
+def _try_file_lock(path: Path) -> IO[str] | None:
+    try:
+        import fcntl
+    except ImportError:
+        return path.open("a")
+    fh = path.open("a")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return None
+    return fh
+
+
+async def _try_sweeper_lock() -> AsyncConnection | IO[str] | None:
+    """
+    Elect one sweeper across workers. The lock is held until the process exits or its
+    connection drops, so another worker takes over when the holder dies.
+    """
+    if IS_POSTGRES:
+        conn = await engine.connect()
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        query = text("SELECT pg_try_advisory_lock(:key)")
+        if await conn.scalar(query, {"key": _SWEEPER_LOCK_KEY}):
+            return conn
+        await conn.close()
+        return None
+    if IS_SQLITE:
+        return await asyncio.to_thread(
+            _try_file_lock, Path(settings.DATA_DIR) / "retention-sweeper.lock"
+        )
+    return None
+
+
+def _file_lock_held(fh: IO[str]) -> bool:
+    """The lock file is still the one we locked (not deleted or replaced)."""
+    try:
+        return os.fstat(fh.fileno()).st_ino == os.stat(fh.name).st_ino
+    except OSError:
+        return False
+
+
+async def _still_held(lock: AsyncConnection | IO[str]) -> bool:
+    if isinstance(lock, AsyncConnection):
+        query = text(
+            "SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND objid = :key"
+            " AND pid = pg_backend_pid() AND granted"
+        )
+        try:
+            return bool(await lock.scalar(query, {"key": _SWEEPER_LOCK_KEY}))
+        except Exception:
+            return False
+    return await asyncio.to_thread(_file_lock_held, lock)
+
+
+async def _release(lock: AsyncConnection | IO[str]) -> None:
+    with contextlib.suppress(Exception):
+        if isinstance(lock, AsyncConnection):
+            await lock.close()
+        else:
+            lock.close()
+
+
+async def retention_sweeper() -> None:
+    """
+    Run expire_documents every RETENTION_SWEEP_INTERVAL_SECONDS until cancelled. Every worker
+    starts this, but only the one holding the sweeper lock deletes; the others keep retrying it.
+    The lock is re-checked before each sweep, so a dropped connection means re-electing.
+    """
+    lock = None
+    try:
+        while True:
+            try:
+                if lock and not await _still_held(lock):
+                    logger.warning("Lost the retention sweeper lock")
+                    await _release(lock)
+                    lock = None
+                lock = lock or await _try_sweeper_lock()
+                if lock:
+                    expired = await expire_documents()
+                    if expired:
+                        logger.info("Retention sweep expired %d documents", expired)
+            except Exception:
+                logger.exception("Retention sweep failed")
+            await asyncio.sleep(settings.RETENTION_SWEEP_INTERVAL_SECONDS)
+    finally:
+        if lock:
+            await _release(lock)
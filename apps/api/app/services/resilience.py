@@ -0,0 +1,196 @@
+"""
+LLM provider resilience: per-attempt timeouts, jittered retries, circuit breakers per provider
+and model, fallback to a second provider and optional hedged requests.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROVIDERS = ("openai", "bedrock")
+
+# (provider, model): breakers and latency stats are kept per route, so a fast cascade model
+# neither trips the configured model's breaker nor skews its hedge delay
+Route = tuple[str, str]
+
+
+class LLMError(Exception):
+    """An LLM call failed after retries (and fallback). Routes turn this into a 5xx."""
+
+    status_code = 502
+
+
+class LLMUnavailableError(LLMError):
+    """The provider's circuit breaker is open."""
+
+    status_code = 503
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; once `reset_seconds` pass, one trial goes."""
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return False
+        self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[Route, CircuitBreaker] = defaultdict(
+    lambda: CircuitBreaker(settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS)
+)
+_latencies: dict[Route, deque[float]] = defaultdict(lambda: deque(maxlen=200))
+
+
+def has_credentials(provider: str) -> bool:
+    if provider == "bedrock":
+        return bool(settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY)
+    return bool(settings.OPENAI_API_KEY)
+
+
+def default_model(provider: str) -> str:
+    return settings.BEDROCK_MODEL_ID if provider == "bedrock" else settings.OPENAI_MODEL
+
+
+def configured_providers() -> list[str]:
+    """LLM_PROVIDER first, then LLM_FALLBACK_PROVIDER when it is set up."""
+    names = [settings.LLM_PROVIDER]
+    fallback = settings.LLM_FALLBACK_PROVIDER
+    if fallback in PROVIDERS and fallback not in names and has_credentials(fallback):
+        names.append(fallback)
+    return names
+
+
+def configured_routes() -> list[Route]:
+    """configured_providers, each with its default model."""
+    return [(p, default_model(p)) for p in configured_providers()]
+
+
+def deadline() -> float:
+    """A time.monotonic() deadline LLM_DEADLINE_SECONDS from now, for call_llm."""
+    return time.monotonic() + settings.LLM_DEADLINE_SECONDS
+
+
+def hedge_delay(route: Route) -> float:
+    """p95 latency of recent successful calls, never below LLM_HEDGE_MIN_DELAY_SECONDS."""
+    samples = sorted(_latencies[route])
+    if len(samples) < 20:
+        return settings.LLM_HEDGE_MIN_DELAY_SECONDS
+    return max(samples[int(0.95 * (len(samples) - 1))], settings.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+
+def _is_retryable(e: Exception) -> bool:
+    status = getattr(e, "status_code", None)
+    response = getattr(e, "response", None)
+    if status is None and isinstance(response, dict):
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status is None or status in (408, 409, 429) or status >= 500
+
+
+async def _with_retries(route: Route, call: Callable[[], Awaitable[T]], retries: int) -> T:
+    name = "/".join(route)
+    breaker = _breakers[route]
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise LLMUnavailableError(f"{name}: circuit open")
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(settings.LLM_TIMEOUT_SECONDS):
+                result = await call()
+        except Exception as e:
+            retryable = _is_retryable(e)
+            # A non-retryable error (4xx) is an answer: the provider is up
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if not retryable or attempt == retries:
+                raise LLMError(f"{name}: {type(e).__name__}: {e}") from e
+            backoff = settings.LLM_RETRY_BACKOFF_SECONDS * 2**attempt
+            logger.warning("%s call failed (%s), retry %d", name, type(e).__name__, attempt + 1)
+            await asyncio.sleep(random.uniform(0, backoff))
+            continue
+        breaker.record_success()
+        _latencies[route].append(time.monotonic() - start)
+        return result
+    raise AssertionError("unreachable")
+
+
+async def call_llm(
+    calls: dict[Route, Callable[[], Awaitable[T]]],
+    until: float | None = None,
+    retries: int | None = None,
+) -> tuple[T, Route]:
+    """
+    Run calls[route] in preference order and return (result, route that answered).
+    The next route starts when the previous one has failed or, with LLM_HEDGE, when it is
+    slower than its hedge_delay; the first success wins and the rest are cancelled.
+    Several calls serving one request share a deadline() passed as `until`. `retries` defaults
+    to LLM_MAX_RETRIES.
+    """
+    if retries is None:
+        retries = settings.LLM_MAX_RETRIES
+    waiting = list(calls)
+    running: dict[asyncio.Task[T], Route] = {}
+    errors: list[BaseException] = []
+
+    def launch_next() -> None:
+        route = waiting.pop(0)
+        running[asyncio.create_task(_with_retries(route, calls[route], retries))] = route
+
+    remaining = (until or deadline()) - time.monotonic()
+    launch_next()
+    try:
+        async with asyncio.timeout(max(remaining, 0)):
+            while running:
+                timeout = None
+                if settings.LLM_HEDGE and waiting:
+                    timeout = hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info("Hedging %s with %s", list(running.values()), waiting[0])
+                    launch_next()
+                    continue
+                for task in done:
+                    route = running.pop(task)
+                    if task.exception() is None:
+                        return task.result(), route
+                    errors.append(task.exception())
+                if not running and waiting:
+                    launch_next()
+    except TimeoutError as e:
+        raise LLMError("LLM deadline exceeded") from e
+    finally:
+        for task in running:
+            task.cancel()
+    unavailable = all(isinstance(e, LLMUnavailableError) for e in errors)
+    raise (LLMUnavailableError if unavailable else LLMError)("; ".join(map(str, errors)))
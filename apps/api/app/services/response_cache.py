@@ -0,0 +1,69 @@
+"""
+Short-lived in-process cache of serialized read responses, invalidated on writes to a document.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.config import settings
+
+LIST_KEY = "list"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Keys are (document_id, name); the document list uses document_id None. Writers invalidate
+    after committing; a reader passes the generation it saw before querying, so a response built
+    from data read before an invalidation is served but not cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: dict[tuple[int | None, str], CachedResponse] = {}
+
+    def get(self, document_id: int | None, name: str) -> CachedResponse | None:
+        entry = self._entries.get((document_id, name))
+        if entry and entry.expires_at > time.monotonic():
+            return entry
+        return None
+
+    def put(
+        self,
+        document_id: int | None,
+        name: str,
+        body: bytes,
+        etag: str,
+        last_modified: datetime | None = None,
+        generation: int | None = None,
+    ) -> CachedResponse:
+        entry = CachedResponse(body, etag, last_modified, time.monotonic() + self.ttl)
+        if self.ttl <= 0 or generation not in (None, self.generation):
+            return entry
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[(document_id, name)] = entry
+        return entry
+
+    def invalidate(self, document_id: int) -> None:
+        """Drop everything cached for this document, plus the document list."""
+        self.generation += 1
+        for key in [k for k in self._entries if k[0] in (document_id, None)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_TTL_SECONDS)
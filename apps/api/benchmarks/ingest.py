@@ -0,0 +1,86 @@
+"""
+Mailbox ingest throughput (no LLM): synthetic mbox → ingest.py pipeline with analysis off.
+
+Usage (from apps/api): uv run python -m benchmarks.ingest [--messages 5000] [--duplicate-every 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from email.message import EmailMessage
+from mailbox import mbox
+from pathlib import Path
+
+
+def _pdf(text: str) -> bytes:
+    """Smallest valid single-page PDF with a line of text, so PyPDF2 extraction succeeds."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def _write_mbox(path: Path, messages: int, duplicate_every: int) -> None:
+    box = mbox(path, create=True)
+    box.lock()
+    try:
+        for i in range(messages):
+            msg = EmailMessage()
+            msg["From"] = "amt@example.de"
+            msg["Subject"] = f"Bescheid {i}"
+            msg.set_content("Sehr geehrte Damen und Herren, anbei der Bescheid.")
+            n = 0 if duplicate_every and i % duplicate_every == 0 else i
+            msg.add_attachment(
+                _pdf(f"Bescheid Nr {n}"), maintype="application", subtype="pdf", filename="b.pdf"
+            )
+            box.add(msg)
+        box.flush()
+    finally:
+        box.unlock()
+        box.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--duplicate-every", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mbox_path = Path(tmp) / "inbox.mbox"
+        _write_mbox(mbox_path, args.messages, args.duplicate_every)
+        env = dict(os.environ)
+        env["DATA_DIR"] = str(Path(tmp) / "data")
+        env["UPLOAD_DIR"] = str(Path(tmp) / "uploads")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/data/bench.db"
+        cmd = [sys.executable, "ingest.py", str(mbox_path), "--no-analyze"]
+        cmd += ["--concurrency", str(args.concurrency)]
+        print("first run:")
+        subprocess.run(cmd, env=env, check=True)
+        print("\nre-run (incremental, nothing new):")
+        subprocess.run(cmd, env=env, check=True)
+
+
+if __name__ == "__main__":
+    main()
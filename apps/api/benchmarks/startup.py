@@ -0,0 +1,96 @@
+"""
+Cold start: import cost of `main` (via -X importtime) and time until /health answers.
+
+Usage (from apps/api): uv run python -m benchmarks.startup [--top 15] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+HEAVY = ("openai", "boto3", "botocore", "PyPDF2", "PIL", "pdf2image", "pytesseract")
+
+
+def _importtime(env: dict[str, str]) -> list[tuple[int, str]]:
+    """Return (cumulative_us, module) for every import made by `import main`, in output order.
+
+    Nested imports are indented two spaces per level and are listed before their parent.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        rows.append((int(cumulative), name[1:].rstrip()))
+    return rows
+
+
+def _time_to_health(env: dict[str, str], port: int) -> float:
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)]
+    cmd += ["--log-level", "warning"]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATA_DIR"] = str(Path(tmp) / "data")
+        env["UPLOAD_DIR"] = str(Path(tmp) / "uploads")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/data/bench.db"
+
+        rows = _importtime(env)
+        main_index = next(i for i, (_, name) in enumerate(rows) if name == "main")
+        main_us = rows[main_index][0]
+        children = []
+        for us, name in reversed(rows[:main_index]):
+            if not name.startswith(" "):
+                break
+            if not name.startswith("   "):
+                children.append((us, name.strip()))
+        print(f"import main: {main_us / 1000:.1f} ms")
+        loaded_heavy = sorted({n.strip().split(".")[0] for _, n in rows} & set(HEAVY))
+        print(f"heavy modules imported at startup: {', '.join(loaded_heavy) or 'none'}")
+        print(f"\ntop {args.top} direct imports of main (cumulative ms):")
+        for us, name in sorted(children, reverse=True)[: args.top]:
+            print(f"{us / 1000:>10.1f}  {name}")
+
+        timings = [_time_to_health(env, args.port) for _ in range(args.runs)]
+        print(
+            f"\ntime to first /health 200 over {args.runs} runs: "
+            f"median {statistics.median(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Throughput at 1/2/4/8 uvicorn workers against a fresh database.
+
+Usage (from apps/api): uv run python -m benchmarks.workers [--db sqlite|URL] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PDF_BYTES = b"%PDF-1.4\n%bench\n"
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+async def _wait_ready(client: httpx.AsyncClient, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not become ready")
+
+
+async def _client_loop(
+    client: httpx.AsyncClient, stop_at: float, latencies: list[float], errors: list[int]
+) -> None:
+    i = 0
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        if i % 4 == 0:
+            files = {"file": ("bench.pdf", PDF_BYTES, "application/pdf")}
+            resp = await client.post("/documents", files=files)
+        else:
+            resp = await client.get("/documents")
+        latencies.append(time.perf_counter() - start)
+        if resp.status_code >= 400:
+            errors.append(resp.status_code)
+        i += 1
+
+
+async def _load(base_url: str, concurrency: int, seconds: float) -> dict[str, float]:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await _wait_ready(client, time.monotonic() + 30)
+        latencies: list[float] = []
+        errors: list[int] = []
+        stop_at = time.monotonic() + seconds
+        await asyncio.gather(
+            *(_client_loop(client, stop_at, latencies, errors) for _ in range(concurrency))
+        )
+    latencies.sort()
+    return {
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": len(errors),
+    }
+
+
+def _run(workers: int, db: str, seconds: float, concurrency: int, port: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATA_DIR"] = str(Path(tmp) / "data")
+        env["UPLOAD_DIR"] = str(Path(tmp) / "uploads")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/data/bench.db" if db == "sqlite" else db
+        cmd = [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ]  # fmt: skip
+        proc = subprocess.Popen(cmd, env=env)
+        try:
+            return asyncio.run(_load(f"http://127.0.0.1:{port}", concurrency, seconds))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="sqlite")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for workers in WORKER_COUNTS:
+        r = _run(workers, args.db, args.seconds, args.concurrency, args.port)
+        print(
+            f"{workers:>7} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+            f"{r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Ingest PDF/image attachments from a local Maildir or mbox into the document pipeline.
+
+Usage (from apps/api): uv run python ingest.py PATH [--concurrency 4] [--no-analyze]
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from app.config import settings
+from app.database import init_db
+from app.services.mailbox import ingest_mailbox
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path, help="Maildir directory or mbox file")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--checkpoint-every", type=int, default=100)
+    parser.add_argument("--no-analyze", action="store_true", help="extract text only")
+    args = parser.parse_args()
+
+    Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+    await init_db()
+    start = time.perf_counter()
+    stats = await ingest_mailbox(
+        args.path,
+        concurrency=args.concurrency,
+        analyze=not args.no_analyze,
+        checkpoint_every=args.checkpoint_every,
+    )
+    elapsed = time.perf_counter() - start
+    for name, value in asdict(stats).items():
+        print(f"{name:>16}: {value}")
+    print(f"{'messages/min':>16}: {stats.messages / elapsed * 60:.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
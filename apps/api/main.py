@@ -2,15 +2,24 @@
 BüroBuddy API — document upload, text extraction, analysis, chat.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config import settings
 from app.database import init_db
 from app.routes import documents
+from app.services.engines import warmup
+from app.services.purge import retention_sweeper
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -19,7 +28,18 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    warmup_task = None
+    if settings.warmup_engines_list:
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup, settings.warmup_engines_list))
+    sweeper = asyncio.create_task(retention_sweeper()) if settings.RETENTION_DAYS > 0 else None
     yield
+    if sweeper:
+        sweeper.cancel()
+        # Its finally block releases the sweeper lock
+        with suppress(asyncio.CancelledError):
+            await sweeper
+    if warmup_task:
+        await warmup_task
     # shutdown if needed
 
 
@@ -30,6 +50,11 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if BrotliMiddleware:
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
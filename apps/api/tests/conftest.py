@@ -0,0 +1,33 @@
+"""
+Tests run against a throwaway SQLite database and upload dir, with no LLM credentials.
+Settings are read at import time, so the environment is set before any app module is imported.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="burobuddy-tests-"))
+(_tmp / "uploads").mkdir()
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{_tmp / 'test.db'}",
+    DATA_DIR=str(_tmp),
+    UPLOAD_DIR=str(_tmp / "uploads"),
+    LLM_PROVIDER="openai",
+    OPENAI_API_KEY="",
+    AWS_ACCESS_KEY_ID="",
+    AWS_SECRET_ACCESS_KEY="",
+    RETENTION_DAYS="0",
+    WARMUP_ENGINES="",
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    from main import app
+
+    with TestClient(app) as c:
+        yield c
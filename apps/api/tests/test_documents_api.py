@@ -0,0 +1,87 @@
+"""Conditional GETs on document routes: ETag / 304 behaviour and cache invalidation."""
+
+import asyncio
+
+from app.database import async_session
+from app.models import DocumentText
+
+
+def _upload(client, name: str) -> int:
+    res = client.post("/documents", files={"file": (name, b"%PDF-1.4", "application/pdf")})
+    assert res.status_code == 200
+    return res.json()["id"]
+
+
+def _add_text(document_id: int) -> None:
+    async def add() -> None:
+        async with async_session() as db:
+            db.add(DocumentText(document_id=document_id, text="Rechnung", extraction_method="pdf"))
+            await db.commit()
+
+    asyncio.run(add())
+
+
+def _delete_all(client) -> None:
+    for doc in client.get("/documents").json():
+        assert client.delete(f"/documents/{doc['id']}").status_code == 204
+
+
+def test_list_not_modified_until_changed(client):
+    _delete_all(client)
+    _upload(client, "a.pdf")
+    first = client.get("/documents")
+    etag = first.headers["etag"]
+    assert client.get("/documents", headers={"If-None-Match": etag}).status_code == 304
+
+    _upload(client, "b.pdf")
+    changed = client.get("/documents", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+
+
+def test_list_etag_changes_when_deleted_id_is_reused(client):
+    _delete_all(client)
+    _upload(client, "a.pdf")
+    b = _upload(client, "b.pdf")
+    etag = client.get("/documents").headers["etag"]
+
+    assert client.delete(f"/documents/{b}").status_code == 204
+    # SQLite hands the deleted max rowid out again
+    c = _upload(client, "c_new.pdf")
+    assert c == b
+
+    res = client.get("/documents", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert "c_new.pdf" in [d["filename"] for d in res.json()]
+
+
+def test_analysis_etag_changes_when_ids_are_reused(client):
+    _delete_all(client)
+    doc = _upload(client, "a.pdf")
+    _add_text(doc)
+    assert client.post(f"/documents/{doc}/analyze").status_code == 200
+    etag = client.get(f"/documents/{doc}/analysis").headers["etag"]
+    cached = client.get(f"/documents/{doc}/analysis", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    assert client.delete(f"/documents/{doc}").status_code == 204
+    again = _upload(client, "b.pdf")
+    assert again == doc
+    _add_text(again)
+    assert client.post(f"/documents/{again}/analyze").status_code == 200
+
+    res = client.get(f"/documents/{again}/analysis", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+
+def test_messages_etag_changes_after_chat(client):
+    _delete_all(client)
+    doc = _upload(client, "a.pdf")
+    _add_text(doc)
+    etag = client.get(f"/documents/{doc}/messages").headers["etag"]
+
+    reply = client.post(f"/documents/{doc}/chat", json={"content": "Was ist das?"})
+    assert reply.status_code == 200
+    res = client.get(f"/documents/{doc}/messages", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert [m["role"] for m in res.json()] == ["user", "assistant"]
@@ -0,0 +1,85 @@
+"""Mailbox ingestion: resuming is scoped per mailbox and duplicate hashes never abort a run."""
+
+import asyncio
+import mailbox
+from email.message import EmailMessage
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.database import async_session, engine, init_db
+from app.models import Document, DocumentAnalysis, DocumentText
+from app.services import mailbox as ingestion
+from app.services.mailbox import Attachment, _checkpoint, ingest_mailbox
+
+
+def _mbox(path: Path, payloads: list[bytes]) -> Path:
+    box = mailbox.mbox(path)
+    for i, data in enumerate(payloads):
+        msg = EmailMessage()
+        msg["Subject"] = f"Brief {i}"
+        msg.set_content("Anbei")
+        msg.add_attachment(data, maintype="application", subtype="pdf", filename=f"{i}.pdf")
+        box.add(msg)
+    box.close()
+    return path
+
+
+def test_rerun_only_resumes_own_mailbox(tmp_path):
+    asyncio.run(init_db())
+    a = _mbox(tmp_path / "a.mbox", [b"%PDF-1.4 only in a"])
+    b = _mbox(tmp_path / "b.mbox", [])
+
+    first = asyncio.run(ingest_mailbox(a, concurrency=1, analyze=False))
+    assert first.attachments == 1
+    # No text extracted yet, so the document stays pending for mailbox a
+    assert first.processed + first.failed == 1
+
+    other = asyncio.run(ingest_mailbox(b, concurrency=1, analyze=False))
+    assert other.processed + other.failed == 0
+
+
+def test_checkpoint_skips_hash_claimed_concurrently(tmp_path):
+    asyncio.run(init_db())
+    data = b"%PDF-1.4 same letter"
+    attachment = Attachment("x.pdf", "application/pdf", data, "c" * 64)
+
+    async def count() -> int:
+        async with async_session() as db:
+            return await db.scalar(select(func.count()).select_from(Document))
+
+    assert len(asyncio.run(_checkpoint("one", ["1"], [attachment]))) == 1
+    before = asyncio.run(count())
+    assert asyncio.run(_checkpoint("two", ["1"], [attachment])) == []
+    assert asyncio.run(count()) == before
+
+
+def test_no_connection_is_held_while_analyzing(monkeypatch):
+    asyncio.run(init_db())
+    checked_out = []
+
+    async def analyze(text: str):
+        checked_out.append(engine.pool.checkedout())
+        return {"summary_en": text}, "stub"
+
+    async def add_document() -> int:
+        async with async_session() as db:
+            doc = Document(filename="a.pdf", mimetype="application/pdf", storage_path="a.pdf")
+            db.add(doc)
+            await db.flush()
+            db.add(DocumentText(document_id=doc.id, text="Rechnung", extraction_method="pdf"))
+            await db.commit()
+            return doc.id
+
+    async def run() -> DocumentAnalysis | None:
+        document_id = await add_document()
+        await ingestion.process_document(document_id)
+        async with async_session() as db:
+            return await db.scalar(
+                select(DocumentAnalysis).where(DocumentAnalysis.document_id == document_id)
+            )
+
+    monkeypatch.setattr(ingestion, "analyze_document_text", analyze)
+    stored = asyncio.run(run())
+    assert checked_out == [0]
+    assert stored.json == {"summary_en": "Rechnung"}
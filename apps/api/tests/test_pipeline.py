@@ -0,0 +1,99 @@
+"""Pipelined OCR + analysis of scanned PDFs: batching, page numbers and the final summary."""
+
+import asyncio
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.services import analyze, pipeline
+
+
+def _part(summary: str, page: int) -> dict:
+    return {
+        "summary_en": summary,
+        "overall_risk": "low",
+        "actions": [],
+        "deadlines": [
+            {
+                "date": "2025-03-01",
+                "meaning_en": summary,
+                "confidence": 0.9,
+                "evidence": {"quote_de": "Frist", "page": page},
+            }
+        ],
+        "entities": {},
+    }
+
+
+def test_batches_use_strong_model_document_pages_and_one_summary(monkeypatch):
+    cascades = []
+
+    async def analyze(text: str, cascade: bool = True):
+        cascades.append(cascade)
+        return _part(f"part {text}", 1), "strong"
+
+    async def reconcile(text: str, summaries: list[str], until: float) -> str:
+        assert text == "p1\n\np3"
+        assert until - time.monotonic() <= settings.LLM_DEADLINE_SECONDS
+        return "one summary"
+
+    monkeypatch.setattr(pipeline, "extract_pdf_text_layer", lambda path: "")
+    monkeypatch.setattr(pipeline, "iter_pdf_ocr_pages", lambda path: iter(["p1", "", "p3"]))
+    monkeypatch.setattr(pipeline, "analyze_document_text", analyze)
+    monkeypatch.setattr(pipeline, "reconcile_summary", reconcile)
+
+    text, method, analysis, model = asyncio.run(
+        pipeline.extract_and_analyze(Path("scan.pdf"), "application/pdf")
+    )
+
+    assert (text, method, model) == ("p1\n\np3", "ocr", "strong")
+    assert cascades == [False, False]
+    assert analysis["summary_en"] == "one summary"
+    assert [d["evidence"]["page"] for d in analysis["deadlines"]] == [1, 3]
+
+
+def test_malformed_batch_output_is_normalized(monkeypatch):
+    outputs = iter(
+        [
+            ({"summary_en": "first", "actions": None, "overall_risk": "medium"}, "strong"),
+            ({"actions": ["pay"], "deadlines": "soon", "entities": [], "summary_en": 1}, "strong"),
+        ]
+    )
+
+    async def analyze(text: str, cascade: bool = True):
+        return next(outputs)
+
+    async def reconcile(text: str, summaries: list[str], until: float) -> str:
+        assert summaries == ["first", ""]
+        return "one summary"
+
+    monkeypatch.setattr(pipeline, "extract_pdf_text_layer", lambda path: "")
+    monkeypatch.setattr(pipeline, "iter_pdf_ocr_pages", lambda path: iter(["p1", "p2"]))
+    monkeypatch.setattr(pipeline, "analyze_document_text", analyze)
+    monkeypatch.setattr(pipeline, "reconcile_summary", reconcile)
+
+    _, _, analysis, _ = asyncio.run(
+        pipeline.extract_and_analyze(Path("scan.pdf"), "application/pdf")
+    )
+
+    assert analysis["actions"] == []
+    assert analysis["deadlines"] == []
+    assert analysis["entities"] == {}
+    assert analysis["overall_risk"] == "medium"
+    assert analysis["summary_en"] == "one summary"
+
+
+def test_reconcile_summary_respects_shared_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(settings, "LLM_FALLBACK_PROVIDER", "")
+
+    async def complete(system: str, prompt: str, model: str, provider: str) -> dict:
+        await asyncio.sleep(10)
+        return {"summary_en": "too late"}
+
+    monkeypatch.setattr(analyze, "_complete", complete)
+    start = time.monotonic()
+    summary = asyncio.run(analyze.reconcile_summary("text", ["a", "b"], start + 0.1))
+    assert summary == "a\n\nb"
+    assert time.monotonic() - start < 1
@@ -0,0 +1,34 @@
+"""Retention sweeper election: one lock holder, released on shutdown, re-elected when lost."""
+
+import asyncio
+import os
+
+from app.config import settings
+from app.services import purge
+
+
+def test_sweeper_lock_is_exclusive_and_released_on_cancel(monkeypatch):
+    monkeypatch.setattr(settings, "RETENTION_SWEEP_INTERVAL_SECONDS", 3600)
+
+    async def run() -> None:
+        sweeper = asyncio.create_task(purge.retention_sweeper())
+        await asyncio.sleep(0.1)
+        assert await purge._try_sweeper_lock() is None
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+        lock = await purge._try_sweeper_lock()
+        assert lock is not None
+        await purge._release(lock)
+
+    asyncio.run(run())
+
+
+def test_lost_file_lock_is_noticed():
+    async def run() -> None:
+        lock = await purge._try_sweeper_lock()
+        assert await purge._still_held(lock)
+        os.remove(lock.name)
+        assert not await purge._still_held(lock)
+        await purge._release(lock)
+
+    asyncio.run(run())
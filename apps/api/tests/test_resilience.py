@@ -0,0 +1,193 @@
+"""call_llm retries, fallback, hedging and circuit breaking; cascade escalation rules."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import analyze, resilience
+from app.services.analyze import escalation_reason
+from app.services.resilience import LLMError, LLMUnavailableError, call_llm
+
+PRIMARY = ("openai", "gpt-4o-mini")
+FALLBACK = ("bedrock", "amazon.nova-lite-v1:0")
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(settings, "LLM_TIMEOUT_SECONDS", 1)
+    monkeypatch.setattr(settings, "LLM_DEADLINE_SECONDS", 5)
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 5)
+    monkeypatch.setattr(settings, "LLM_BREAKER_RESET_SECONDS", 30)
+    monkeypatch.setattr(settings, "LLM_HEDGE", False)
+    resilience._breakers.clear()
+    resilience._latencies.clear()
+
+
+def _flaky(failures: int, exc: type[Exception] = ServerError, result: str = "ok"):
+    calls = []
+
+    async def call() -> str:
+        calls.append(1)
+        if len(calls) <= failures:
+            raise exc("boom")
+        return result
+
+    return call, calls
+
+
+def test_retries_retryable_errors():
+    call, calls = _flaky(2)
+    assert asyncio.run(call_llm({PRIMARY: call})) == ("ok", PRIMARY)
+    assert len(calls) == 3
+
+
+def test_does_not_retry_client_errors():
+    call, calls = _flaky(1, BadRequest)
+    with pytest.raises(LLMError):
+        asyncio.run(call_llm({PRIMARY: call}))
+    assert len(calls) == 1
+
+
+def test_falls_back_when_primary_fails():
+    primary, _ = _flaky(10)
+    fallback, _ = _flaky(0, result="fallback")
+    result = asyncio.run(call_llm({PRIMARY: primary, FALLBACK: fallback}))
+    assert result == ("fallback", FALLBACK)
+
+
+def test_hedges_slow_primary(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE", True)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.05)
+
+    async def slow() -> str:
+        await asyncio.sleep(0.5)
+        return "slow"
+
+    fallback, _ = _flaky(0, result="hedge")
+    start = time.monotonic()
+    result = asyncio.run(call_llm({PRIMARY: slow, FALLBACK: fallback}))
+    assert result == ("hedge", FALLBACK)
+    assert time.monotonic() - start < 0.4
+
+
+def test_breaker_opens_after_consecutive_failures(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 3)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    call, calls = _flaky(100)
+    for _ in range(3):
+        with pytest.raises(LLMError):
+            asyncio.run(call_llm({PRIMARY: call}))
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(call_llm({PRIMARY: call}))
+    assert len(calls) == 3
+
+
+def test_half_open_trial_with_client_error_closes_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "LLM_BREAKER_RESET_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    failing, _ = _flaky(100)
+    with pytest.raises(LLMError):
+        asyncio.run(call_llm({PRIMARY: failing}))
+    time.sleep(0.06)
+
+    rejected, _ = _flaky(1, BadRequest)
+    with pytest.raises(LLMError) as exc:
+        asyncio.run(call_llm({PRIMARY: rejected}))
+    assert not isinstance(exc.value, LLMUnavailableError)
+    call, _ = _flaky(0)
+    assert asyncio.run(call_llm({PRIMARY: call})) == ("ok", PRIMARY)
+
+
+def test_breakers_are_kept_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    failing, _ = _flaky(100)
+    with pytest.raises(LLMError):
+        asyncio.run(call_llm({("openai", "fast-model"): failing}))
+    call, _ = _flaky(0)
+    assert asyncio.run(call_llm({PRIMARY: call})) == ("ok", PRIMARY)
+
+
+def test_shared_deadline_bounds_consecutive_calls():
+    async def slow() -> str:
+        await asyncio.sleep(0.2)
+        return "late"
+
+    async def cascade() -> None:
+        until = time.monotonic() + 0.3
+        await call_llm({PRIMARY: slow}, until)
+        await call_llm({PRIMARY: slow}, until)
+
+    with pytest.raises(LLMError, match="deadline"):
+        asyncio.run(cascade())
+
+
+def test_hung_fast_model_leaves_time_to_escalate(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(settings, "OPENAI_MODEL", "strong")
+    monkeypatch.setattr(settings, "CASCADE_FAST_MODEL", "fast")
+    monkeypatch.setattr(settings, "LLM_FALLBACK_PROVIDER", "")
+    monkeypatch.setattr(settings, "LLM_DEADLINE_SECONDS", 1)
+    monkeypatch.setattr(settings, "CASCADE_FAST_DEADLINE_SECONDS", 0.2)
+    calls = []
+
+    async def complete(system: str, prompt: str, model: str, provider: str) -> dict:
+        calls.append(model)
+        if model == "fast":
+            await asyncio.sleep(10)
+        return _analysis()
+
+    monkeypatch.setattr(analyze, "_complete", complete)
+    result, model = asyncio.run(analyze.analyze_document_text("Bitte zahlen Sie."))
+    assert model == "strong"
+    assert calls == ["fast", "strong"]
+
+
+def _analysis(risk: str = "low", confidence: float = 0.9) -> dict:
+    return {
+        "language_detected": "de",
+        "summary_en": "Tax assessment",
+        "overall_risk": risk,
+        "actions": [
+            {
+                "title_en": "Pay",
+                "details_en": "Pay the balance",
+                "due_date": "2025-03-01",
+                "confidence": confidence,
+                "category": "payment",
+                "evidence": {"quote_de": "zahlen Sie", "page": 1},
+            }
+        ],
+        "deadlines": [],
+        "entities": {},
+    }
+
+
+def test_escalation_reason_accepts_confident_low_risk():
+    assert escalation_reason(_analysis()) is None
+
+
+def test_escalation_reason_escalates_high_risk():
+    assert escalation_reason(_analysis(risk="high")) == "overall_risk is high"
+
+
+def test_escalation_reason_escalates_low_confidence():
+    assert "confidence 0.30" in escalation_reason(_analysis(confidence=0.3))
+
+
+def test_escalation_reason_escalates_invalid_schema():
+    assert escalation_reason({"summary_en": 1}).startswith("schema validation failed")
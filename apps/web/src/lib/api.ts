@@ -65,6 +65,16 @@ export type DocumentAnalysis = {
   };
 };
 
+export type PurgeJobOut = {
+  id: number;
+  status: "pending" | "running" | "done" | "failed";
+  total: number;
+  deleted: number;
+  error: string | null;
+  created_at: string;
+  finished_at: string | null;
+};
+
 export type ChatMessageOut = {
   role: string;
   content: string;
@@ -160,11 +170,29 @@ export async function deleteDocument(id: number): Promise<void> {
   }
 }
 
-/** Delete all documents and all related data. */
+export async function getPurgeJob(id: number): Promise<PurgeJobOut> {
+  return request<PurgeJobOut>(`/documents/purges/${id}`);
+}
+
+const PURGE_POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+/** Delete all documents and all related data; resolves once the background purge finishes. */
 export async function deleteAllDocuments(): Promise<void> {
   const res = await fetch(`${API_URL}/documents`, { method: "DELETE" });
   if (!res.ok) {
     const text = await res.text();
     throw new Error(`Delete all failed: ${text || res.statusText}`);
   }
+  let job: PurgeJobOut = await res.json();
+  const deadline = Date.now() + PURGE_POLL_TIMEOUT_MS;
+  while (job.status === "pending" || job.status === "running") {
+    if (Date.now() > deadline) {
+      throw new Error("Delete all is taking too long; check again later");
+    }
+    await new Promise((resolve) => setTimeout(resolve, 500));
+    job = await getPurgeJob(job.id);
+  }
+  if (job.status === "failed") {
+    throw new Error(`Delete all failed: ${job.error ?? "unknown error"}`);
+  }
 }